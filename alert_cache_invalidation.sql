@@ -0,0 +1,44 @@
+-- Low-stock alert cache invalidation (optional)
+-- Install only when the API runs with REDIS_URL and `python alert_cache.py` is
+-- running. Every transaction that sends a NOTIFY takes PostgreSQL's global
+-- notify lock at commit, so without a listener these triggers are pure cost.
+--
+-- Statement-level triggers: one notification per affected company per
+-- statement (and identical notifications within a transaction are delivered
+-- once), regardless of how many rows the statement touched.
+
+CREATE OR REPLACE FUNCTION notify_low_stock_invalidate()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('low_stock_invalidate', c.company_id::text)
+        FROM (
+            SELECT DISTINCT w.company_id
+            FROM old_rows o
+            JOIN warehouses w ON w.id = o.warehouse_id
+        ) c;
+    ELSE
+        PERFORM pg_notify('low_stock_invalidate', c.company_id::text)
+        FROM (
+            SELECT DISTINCT w.company_id
+            FROM new_rows n
+            JOIN warehouses w ON w.id = n.warehouse_id
+        ) c;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Transition tables allow only one event per trigger
+CREATE TRIGGER notify_inventory_insert_low_stock AFTER INSERT ON inventory
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_low_stock_invalidate();
+CREATE TRIGGER notify_inventory_update_low_stock AFTER UPDATE ON inventory
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_low_stock_invalidate();
+CREATE TRIGGER notify_inventory_delete_low_stock AFTER DELETE ON inventory
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_low_stock_invalidate();
+CREATE TRIGGER notify_movements_insert_low_stock AFTER INSERT ON inventory_movements
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_low_stock_invalidate();
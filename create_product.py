@@ -1,3 +1,36 @@
+import psycopg
+from sqlalchemy import insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# Products sent per bulk INSERT statement
+BULK_INSERT_PAGE_SIZE = 1000
+
+# One statement per page: the columns arrive as arrays, unnest() turns them
+# back into rows, and the products/inventory INSERTs chain through CTEs. The
+# final SELECT returns product ids in request order.
+BULK_INSERT_SQL = """
+    WITH new_rows AS (
+        SELECT *
+        FROM unnest(%s::text[], %s::text[], %s::numeric[], %s::bigint[], %s::integer[])
+            WITH ORDINALITY AS r(name, sku, price, warehouse_id, quantity, position)
+    ),
+    new_products AS (
+        INSERT INTO products (name, sku, price)
+        SELECT name, sku, price FROM new_rows ORDER BY position
+        RETURNING id, sku
+    ),
+    new_inventory AS (
+        INSERT INTO inventory (product_id, warehouse_id, quantity)
+        SELECT np.id, nr.warehouse_id, nr.quantity
+        FROM new_products np
+        JOIN new_rows nr ON nr.sku = np.sku
+    )
+    SELECT np.id
+    FROM new_products np
+    JOIN new_rows nr ON nr.sku = np.sku
+    ORDER BY nr.position
+"""
+
 @app.route('/api/products', methods=['POST'])
 def create_product():
     try:
@@ -7,40 +40,119 @@ def create_product():
         if not data or 'name' not in data or 'sku' not in data or 'warehouse_id' not in data:
             return {"error": "Missing required fields: name, sku, warehouse_id"}, 400
         
-        # Check if SKU already exists (must be unique across platform)
-        existing_product = Product.query.filter_by(sku=data['sku']).first()
-        if existing_product:
-            return {"error": "SKU already exists"}, 409
-        
         # Handle optional fields with defaults
         price = float(data.get('price', 0.0)) if data.get('price') is not None else 0.0
         initial_quantity = int(data.get('initial_quantity', 0)) if data.get('initial_quantity') is not None else 0
+        # Bound as a literal below, so coerce it here: a JSON string id would
+        # otherwise be sent as varchar into the bigint column
+        warehouse_id = int(data['warehouse_id'])
         
-        # Start transaction - create product without warehouse_id (products exist across warehouses)
-        product = Product(
-            name=data['name'],
-            sku=data['sku'],
-            price=price
+        # Create product without warehouse_id (products exist across warehouses)
+        # and its inventory record for the specific warehouse in one statement:
+        # the product INSERT runs as a CTE and feeds its generated id straight
+        # into the inventory INSERT, so no flush() round-trip is needed.
+        # SKU uniqueness (across platform) is enforced by the unique index on
+        # products.sku: a duplicate inserts nothing, so no inventory row either
+        new_product = (
+            pg_insert(Product)
+            .values(name=data['name'], sku=data['sku'], price=price)
+            .on_conflict_do_nothing(index_elements=['sku'])
+            .returning(Product.id)
+            .cte('new_product')
         )
-        
-        db.session.add(product)
-        db.session.flush()  # Get product.id without committing
-        
-        # Create inventory record for specific warehouse
-        inventory = Inventory(
-            product_id=product.id,
-            warehouse_id=data['warehouse_id'],
-            quantity=initial_quantity
+        stmt = (
+            insert(Inventory)
+            .from_select(
+                ['product_id', 'warehouse_id', 'quantity'],
+                select(
+                    new_product.c.id,
+                    literal(warehouse_id, type_=Inventory.warehouse_id.type),
+                    literal(initial_quantity, type_=Inventory.quantity.type)
+                )
+            )
+            .returning(Inventory.product_id)
         )
         
-        db.session.add(inventory)
+        product_id = db.session.execute(stmt).scalar()
+        if product_id is None:
+            db.session.rollback()
+            return {"error": "SKU already exists"}, 409
+        
         db.session.commit()  # Single commit for atomicity
         
-        return {"message": "Product created", "product_id": product.id}, 201
+        return {"message": "Product created", "product_id": product_id}, 201
         
     except ValueError as e:
         db.session.rollback()
-        return {"error": "Invalid data type for price or quantity"}, 400
+        return {"error": "Invalid data type for price, quantity or warehouse_id"}, 400
     except Exception as e:
         db.session.rollback()
         return {"error": "Internal server error"}, 500
+
+
+@app.route('/api/products/bulk', methods=['POST'])
+def create_products_bulk():
+    try:
+        data = request.json
+        
+        # Validate payload shape and required fields for every product
+        if not isinstance(data, list) or not data:
+            return {"error": "Request body must be a non-empty list of products"}, 400
+        for item in data:
+            if not isinstance(item, dict) or 'name' not in item or 'sku' not in item or 'warehouse_id' not in item:
+                return {"error": "Missing required fields: name, sku, warehouse_id"}, 400
+        
+        skus = [item['sku'] for item in data]
+        if len(set(skus)) != len(skus):
+            return {"error": "Duplicate SKUs in request"}, 409
+        
+        # Handle optional fields with defaults
+        rows = [
+            (
+                item['name'],
+                item['sku'],
+                float(item['price']) if item.get('price') is not None else 0.0,
+                int(item['warehouse_id']),
+                int(item['initial_quantity']) if item.get('initial_quantity') is not None else 0
+            )
+            for item in data
+        ]
+        
+        # Go straight to the psycopg connection: each page is a single
+        # multi-row statement instead of SQLAlchemy's per-batch bookkeeping
+        product_ids = []
+        raw_connection = db.engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            for start in range(0, len(rows), BULK_INSERT_PAGE_SIZE):
+                page = rows[start:start + BULK_INSERT_PAGE_SIZE]
+                cursor.execute(BULK_INSERT_SQL, [list(column) for column in zip(*page)])
+                product_ids.extend(product_id for (product_id,) in cursor.fetchall())
+            raw_connection.commit()  # Single commit for the whole batch
+        except psycopg.errors.UniqueViolation:
+            # Unique index on products.sku rejected the batch
+            raw_connection.rollback()
+            return {"error": "SKU already exists"}, 409
+        except psycopg.errors.ForeignKeyViolation:
+            # inventory.warehouse_id references a warehouse that doesn't exist
+            raw_connection.rollback()
+            return {"error": "Unknown warehouse_id"}, 400
+        except psycopg.errors.CheckViolation:
+            # inventory quantity CHECK (>= 0)
+            raw_connection.rollback()
+            return {"error": "initial_quantity must not be negative"}, 400
+        except psycopg.errors.IntegrityError:
+            raw_connection.rollback()
+            return {"error": "Invalid product data"}, 400
+        except Exception:
+            raw_connection.rollback()
+            raise
+        finally:
+            raw_connection.close()
+        
+        return {"message": "Products created", "product_ids": product_ids}, 201
+        
+    except ValueError as e:
+        return {"error": "Invalid data type for price, quantity or warehouse_id"}, 400
+    except Exception as e:
+        return {"error": "Internal server error"}, 500
@@ -9,6 +9,25 @@ and its business logic without requiring a database connection.
 
 import json
 from datetime import datetime
+from operator import itemgetter
+
+def _build_alert(row, days_until_stockout):
+    """Shape one simulated row into the API's alert format"""
+    return {
+        "product_id": row['product_id'],
+        "product_name": row['product_name'],
+        "sku": row['sku'],
+        "warehouse_id": row['warehouse_id'],
+        "warehouse_name": row['warehouse_name'],
+        "current_stock": row['current_stock'],
+        "threshold": row['threshold'],
+        "days_until_stockout": days_until_stockout,
+        "supplier": {
+            "id": row['supplier_id'],
+            "name": row['supplier_name'],
+            "contact_email": row['contact_email']
+        }
+    }
 
 def simulate_low_stock_alerts(company_id):
     """
@@ -69,33 +88,18 @@ def simulate_low_stock_alerts(company_id):
         }
     ]
     
-    alerts = []
-    for row in mock_data:
-        # Calculate days until stockout based on sales velocity
-        if row['daily_sales_rate'] > 0:
-            days_until_stockout = int(row['current_stock'] / row['daily_sales_rate'])
-        else:
-            days_until_stockout = 999  # No recent sales
-        
-        alert = {
-            "product_id": row['product_id'],
-            "product_name": row['product_name'],
-            "sku": row['sku'],
-            "warehouse_id": row['warehouse_id'],
-            "warehouse_name": row['warehouse_name'],
-            "current_stock": row['current_stock'],
-            "threshold": row['threshold'],
-            "days_until_stockout": min(days_until_stockout, 999),
-            "supplier": {
-                "id": row['supplier_id'],
-                "name": row['supplier_name'],
-                "contact_email": row['contact_email']
-            }
-        }
-        alerts.append(alert)
+    # Calculate days until stockout based on sales velocity (999 = no recent sales)
+    alerts = [
+        _build_alert(
+            row,
+            min(int(row['current_stock'] / row['daily_sales_rate']), 999)
+            if row['daily_sales_rate'] > 0 else 999
+        )
+        for row in mock_data
+    ]
     
     # Sort by urgency (days until stockout, then by current stock level)
-    alerts.sort(key=lambda x: (x['days_until_stockout'], x['current_stock']))
+    alerts.sort(key=itemgetter('days_until_stockout', 'current_stock'))
     
     return {
         "alerts": alerts,
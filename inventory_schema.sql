@@ -184,6 +184,8 @@ CREATE TABLE inventory_locations (
 -- =============================================
 -- INDEXES FOR PERFORMANCE
 -- =============================================
+-- On an existing, populated database create new indexes with
+-- CREATE INDEX CONCURRENTLY to avoid blocking writes.
 
 -- Company indexes
 CREATE INDEX idx_companies_status ON companies(status);
@@ -192,6 +194,7 @@ CREATE INDEX idx_companies_name ON companies(name);
 -- Warehouse indexes
 CREATE INDEX idx_warehouses_company_id ON warehouses(company_id);
 CREATE INDEX idx_warehouses_status ON warehouses(status);
+CREATE INDEX idx_warehouses_company_active ON warehouses(company_id) WHERE status = 'active'; -- Low-stock alerts anchor
 
 -- Product indexes
 CREATE INDEX idx_products_sku ON products(sku);
@@ -200,7 +203,7 @@ CREATE INDEX idx_products_is_active ON products(is_active);
 CREATE INDEX idx_products_is_bundle ON products(is_bundle);
 
 -- Inventory indexes
-CREATE INDEX idx_inventory_warehouse_product ON inventory(warehouse_id, product_id);
+CREATE INDEX idx_inventory_warehouse_product ON inventory(warehouse_id, product_id) INCLUDE (quantity_available); -- Covering: index-only scan for low-stock check
 CREATE INDEX idx_inventory_product_id ON inventory(product_id);
 CREATE INDEX idx_inventory_last_updated ON inventory(last_updated);
 
@@ -209,11 +212,16 @@ CREATE INDEX idx_movements_warehouse_product ON inventory_movements(warehouse_id
 CREATE INDEX idx_movements_created_at ON inventory_movements(created_at);
 CREATE INDEX idx_movements_type ON inventory_movements(movement_type);
 CREATE INDEX idx_movements_reference ON inventory_movements(reference_type, reference_id);
+-- Covers the 30-day sales velocity aggregation (outbound movements only)
+CREATE INDEX idx_im_recent_out ON inventory_movements(warehouse_id, product_id, created_at)
+    INCLUDE (quantity)
+    WHERE movement_type = 'out' AND quantity < 0;
 
 -- Supplier relationships indexes
 CREATE INDEX idx_company_suppliers_company ON company_suppliers(company_id);
 CREATE INDEX idx_supplier_products_supplier ON supplier_products(supplier_id);
 CREATE INDEX idx_supplier_products_product ON supplier_products(product_id);
+CREATE INDEX idx_supplier_products_preference ON supplier_products(product_id, is_preferred_supplier DESC, cost_price) WHERE is_active = true; -- Preferred supplier ranking
 
 -- Bundle indexes
 CREATE INDEX idx_bundles_bundle_product ON product_bundles(bundle_product_id);
@@ -250,6 +258,9 @@ $$ language 'plpgsql';
 
 CREATE TRIGGER update_inventory_timestamp BEFORE UPDATE ON inventory FOR EACH ROW EXECUTE FUNCTION update_inventory_timestamp();
 
+-- Optional: alert_cache_invalidation.sql adds NOTIFY triggers for the low-stock
+-- alert cache; install it only when the cache and its listener are deployed.
+
 -- =============================================
 -- SAMPLE VIEWS FOR COMMON QUERIES
 -- =============================================
@@ -288,3 +299,42 @@ WHERE i.quantity_available <= p.reorder_level
 AND p.reorder_level > 0
 AND p.is_active = true
 ORDER BY shortage DESC;
+
+-- =============================================
+-- MATERIALIZED VIEWS
+-- =============================================
+
+-- Preferred supplier per product (or cheapest active supplier if none is
+-- preferred). Precomputed because supplier assignments change rarely while
+-- the low-stock alerts endpoint reads this on every request.
+-- Refresh nightly (e.g. cron: 0 2 * * * psql -c "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_preferred_supplier");
+-- CONCURRENTLY keeps the view readable during refresh and needs the unique index below.
+-- ROW_NUMBER() lets the planner walk idx_supplier_products_preference in
+-- order instead of sorting every supplier_products row for DISTINCT ON.
+CREATE MATERIALIZED VIEW mv_preferred_supplier AS
+SELECT
+    product_id,
+    supplier_id,
+    supplier_name,
+    contact_email,
+    lead_time_days,
+    minimum_order_quantity
+FROM (
+    SELECT
+        sp.product_id,
+        s.id as supplier_id,
+        s.name as supplier_name,
+        COALESCE(s.email, s.contact_person) as contact_email,
+        sp.lead_time_days,
+        sp.minimum_order_quantity,
+        ROW_NUMBER() OVER (
+            PARTITION BY sp.product_id
+            ORDER BY sp.is_preferred_supplier DESC, sp.cost_price ASC
+        ) as supplier_rank
+    FROM supplier_products sp
+    JOIN suppliers s ON s.id = sp.supplier_id
+    WHERE sp.is_active = true AND s.status = 'active'
+) ranked
+WHERE supplier_rank = 1;
+
+CREATE UNIQUE INDEX idx_mv_preferred_supplier_product ON mv_preferred_supplier(product_id);
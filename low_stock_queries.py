@@ -0,0 +1,159 @@
+"""
+SQL shared by the Flask (low_stock_alerts.py) and ASGI (low_stock_alerts_asgi.py)
+low-stock alert endpoints. Row queries use SQLAlchemy's :name parameters; the
+document queries use asyncpg's positional $n parameters.
+"""
+
+import re
+
+# Complex query to get low stock alerts with business logic, split into
+# fragments so the per-warehouse ranking is only part of the statement when a
+# limit is requested (a generic prepared plan can't skip an unused window).
+_LOW_STOCK_CTES = '''
+    WITH company_warehouses AS MATERIALIZED (
+        -- Active warehouses for the company; small and selective, so
+        -- materializing it gives the planner an accurate row estimate
+        SELECT id
+        FROM warehouses
+        WHERE company_id = :company_id AND status = 'active'
+    ),
+    recent_sales AS MATERIALIZED (
+        -- Calculate sales velocity (units sold per day) for the last 30 days
+        SELECT 
+            im.warehouse_id,
+            im.product_id,
+            SUM(ABS(im.quantity)) as total_sold,
+            COUNT(DISTINCT DATE(im.created_at)) as active_days,
+            CASE 
+                WHEN COUNT(DISTINCT DATE(im.created_at)) > 0 
+                THEN SUM(ABS(im.quantity))::FLOAT / COUNT(DISTINCT DATE(im.created_at))
+                ELSE 0
+            END as daily_sales_rate
+        FROM inventory_movements im
+        JOIN company_warehouses cw ON cw.id = im.warehouse_id
+        WHERE im.movement_type = 'out' 
+          AND im.created_at >= NOW() - INTERVAL '30 days'
+          AND im.quantity < 0  -- Outbound movements are negative
+        GROUP BY im.warehouse_id, im.product_id
+        HAVING SUM(ABS(im.quantity)) > 0  -- Only products with actual sales
+    ),
+    low_stock AS (
+        -- days_until_stockout is computed once here and referenced by alias
+        -- for ranking and ordering
+        SELECT 
+            p.id as product_id,
+            p.name as product_name,
+            p.sku,
+            i.warehouse_id,
+            w.name as warehouse_name,
+            i.quantity_available as current_stock,
+            COALESCE(p.reorder_level, 10) as threshold,  -- Default threshold if not set
+            -- Calculate days until stockout based on sales velocity
+            CASE 
+                WHEN rs.daily_sales_rate > 0 
+                THEN LEAST(CEIL(i.quantity_available::FLOAT / rs.daily_sales_rate), 999)  -- Cap at 999
+                ELSE 999  -- No recent sales, set high value
+            END as days_until_stockout,
+            ps.supplier_id,
+            ps.supplier_name,
+            ps.contact_email,
+            ps.lead_time_days,
+            ps.minimum_order_quantity,
+            rs.daily_sales_rate,
+            rs.total_sold as units_sold_30_days
+        FROM inventory i
+        JOIN company_warehouses cw ON i.warehouse_id = cw.id
+        JOIN warehouses w ON i.warehouse_id = w.id
+        JOIN products p ON i.product_id = p.id
+        JOIN recent_sales rs ON rs.warehouse_id = i.warehouse_id AND rs.product_id = i.product_id
+        -- Preferred supplier per product, precomputed (see inventory_schema.sql)
+        LEFT JOIN mv_preferred_supplier ps ON ps.product_id = p.id
+        WHERE i.quantity_available <= COALESCE(p.reorder_level, 10)
+          AND p.is_active = true
+    )'''
+
+_PER_WAREHOUSE_LIMIT_CTE = ''',
+    ranked_alerts AS (
+        -- Rank alerts within each warehouse so the per-warehouse limit is
+        -- applied server-side
+        SELECT 
+            ls.*,
+            ROW_NUMBER() OVER (
+                PARTITION BY ls.warehouse_id
+                ORDER BY ls.days_until_stockout ASC, ls.current_stock ASC
+            ) as warehouse_rank
+        FROM low_stock ls
+    ),
+    limited_alerts AS (
+        SELECT * FROM ranked_alerts WHERE warehouse_rank <= :max_per_warehouse
+    )
+'''
+
+
+# One alert as JSON; PostgreSQL serializes it so Python never builds the dicts
+_ALERT_JSON = '''json_build_object(
+        'product_id', t.product_id,
+        'product_name', t.product_name,
+        'sku', t.sku,
+        'warehouse_id', t.warehouse_id,
+        'warehouse_name', t.warehouse_name,
+        'current_stock', t.current_stock,
+        'threshold', t.threshold,
+        'days_until_stockout', t.days_until_stockout,
+        'supplier', json_build_object(
+            'id', t.supplier_id,
+            'name', COALESCE(t.supplier_name, 'No Supplier Found'),
+            'contact_email', COALESCE(t.contact_email, 'No Contact Available')
+        )
+    )::text'''
+
+_URGENCY_ORDER = '''
+        t.days_until_stockout ASC,  -- Most urgent first
+        t.current_stock ASC  -- Then by lowest stock'''
+
+
+def _alert_rows(source):
+    # One row per alert, streamed by the caller
+    return '''
+    SELECT ''' + _ALERT_JSON + ''' as alert
+    FROM ''' + source + ''' t
+    ORDER BY''' + _URGENCY_ORDER + '''
+'''
+
+
+def _alert_document(source):
+    # Whole response as a single text value; the alerts are already JSON text,
+    # so they are concatenated rather than re-parsed, in urgency order
+    return '''
+    SELECT '{"alerts":[' ||
+           COALESCE(string_agg(''' + _ALERT_JSON + ''', ',' ORDER BY''' + _URGENCY_ORDER + '''
+           ), '') ||
+           '],"total_alerts":' || COUNT(*) || '}'
+    FROM ''' + source + ''' t
+'''
+
+
+def _positional(query, param_names):
+    """Rewrite :name placeholders to asyncpg's $n, in the given order"""
+    for position, name in enumerate(param_names, start=1):
+        query = re.sub(r'(?<!:):' + name + r'\b', '$' + str(position), query)
+    leftover = re.search(r'(?<!:):[A-Za-z_]\w*', query)
+    if leftover:
+        raise ValueError(f"Unmapped query parameter {leftover.group()}")
+    return query
+
+
+# One alert (JSON text) per row; takes :company_id
+LOW_STOCK_ALERTS_QUERY = _LOW_STOCK_CTES + _alert_rows('low_stock')
+# Same, keeping only the :max_per_warehouse most urgent alerts per warehouse
+LOW_STOCK_ALERTS_PER_WAREHOUSE_QUERY = _LOW_STOCK_CTES + _PER_WAREHOUSE_LIMIT_CTE + _alert_rows('limited_alerts')
+
+# Single-document variants for asyncpg callers ($1 = company_id, $2 = max_per_warehouse)
+LOW_STOCK_ALERTS_DOCUMENT_QUERY = _positional(
+    _LOW_STOCK_CTES + _alert_document('low_stock'),
+    ['company_id']
+)
+LOW_STOCK_ALERTS_PER_WAREHOUSE_DOCUMENT_QUERY = _positional(
+    _LOW_STOCK_CTES + _PER_WAREHOUSE_LIMIT_CTE + _alert_document('limited_alerts'),
+    ['company_id', 'max_per_warehouse']
+)
@@ -1,8 +1,12 @@
-from flask import Flask, jsonify
-import json
+from flask import Flask, Response
+import orjson
 
 app = Flask(__name__)
 
+def json_response(payload, status=200):
+    """Serialize with orjson (C encoder, emits bytes) instead of the stdlib json used by jsonify"""
+    return Response(orjson.dumps(payload), status=status, mimetype='application/json')
+
 @app.route('/api/companies/<int:company_id>/alerts/low-stock', methods=['GET'])
 def low_stock_alerts_mock(company_id):
     """
@@ -45,17 +49,17 @@ def low_stock_alerts_mock(company_id):
     
     # Validate company_id
     if company_id <= 0:
-        return jsonify({"error": "Invalid company ID"}), 400
+        return json_response({"error": "Invalid company ID"}, 400)
     
-    return jsonify({
+    return json_response({
         "alerts": mock_alerts,
         "total_alerts": len(mock_alerts)
-    }), 200
+    })
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Simple health check endpoint"""
-    return jsonify({"status": "healthy", "message": "Low-stock alerts API is running"}), 200
+    return json_response({"status": "healthy", "message": "Low-stock alerts API is running"})
 
 if __name__ == '__main__':
     print("Starting mock low-stock alerts API...")